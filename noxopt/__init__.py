@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import sys
-
-from nox.sessions import Session
+from importlib import import_module
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
 
 from noxopt._option import Option
-from noxopt.noxopt import NoxOpt
 
 
+if TYPE_CHECKING:
+    from nox.sessions import Session
+
+    from noxopt.noxopt import NoxOpt
+
 if sys.version_info < (3, 10):  # pragma: no cover
     from typing_extensions import Annotated
 else:
@@ -20,3 +25,19 @@ else:
 
 __version__ = _version(__name__)
 __all__ = ["NoxOpt", "Option", "Session", "Annotated"]
+
+
+def __getattr__(name: str) -> Any:
+    # defer importing Nox until it's needed - Option alone doesn't depend on it
+    value: Any
+    if name == "NoxOpt":
+        from noxopt.noxopt import NoxOpt as value
+    elif name == "Session":
+        from nox.sessions import Session as value
+    else:
+        # submodules like noxopt.noxopt were importable as attributes before
+        if find_spec(f"{__name__}.{name}") is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = import_module(f"{__name__}.{name}")
+    globals()[name] = value
+    return value
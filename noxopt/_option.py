@@ -3,40 +3,70 @@ from __future__ import annotations
 import sys
 from argparse import ArgumentParser
 from dataclasses import dataclass, fields, replace
-from inspect import Parameter, signature
+from inspect import CO_VARARGS, CO_VARKEYWORDS, Parameter, signature
 from typing import Any, Callable, Container, Sequence, cast
+from weakref import WeakKeyDictionary
 
 
 if sys.version_info < (3, 10):  # pragma: no cover
-    from typing_extensions import Annotated, get_args, get_origin, get_type_hints
+    from typing_extensions import get_type_hints
 else:
-    from typing import Annotated, get_args, get_origin, get_type_hints
+    from typing import get_type_hints
+
+if sys.version_info < (3, 10):  # pragma: no cover
+    _DATACLASS_OPTIONS: dict[str, Any] = {}
+else:
+    _DATACLASS_OPTIONS = {"slots": True}
 
 
 UNDEFINED = cast(Any, type("Undefined", (), {"__repr__": lambda self: "UNDEFINED"})())
 
+# signature() and get_type_hints() are costly - only inspect each function once
+_SIG_CACHE: WeakKeyDictionary[
+    Callable[..., Any], dict[str, tuple[Any, Any]]
+] = WeakKeyDictionary()
+# options for each function keyed by whether options must be explicit
+_OPTIONS_CACHE: WeakKeyDictionary[
+    Callable[..., Any], dict[bool, dict[str, Option]]
+] = WeakKeyDictionary()
+
 
 def get_function_options(
     func: Callable[..., Any], explicit_options: bool | None = None
 ) -> dict[str, Option]:
-    options: dict[str, Option] = {}
-
-    explicit_options = (
+    explicit_options = bool(
         explicit_options
         # we require parametrized sessions to have explicitely declared options
-        or bool(getattr(func, "parametrize", None))
+        or getattr(func, "parametrize", None)
     )
 
-    func = _get_wrapped_func(func)
-    for k, (d, a) in _get_function_defaults_and_annotations(func).items():
+    options_by_explicit = _OPTIONS_CACHE.get(func)
+    if options_by_explicit is None:
+        options_by_explicit = _OPTIONS_CACHE[func] = {}
+    elif explicit_options in options_by_explicit:
+        return options_by_explicit[explicit_options]
+
+    options: dict[str, Option] = {}
+    unwrapped_func = _get_wrapped_func(func)
+    for k, (d, a) in _get_function_defaults_and_annotations(unwrapped_func).items():
         opt = _create_option(k, d, a, explicit_options)
         if opt is not None:
             options[k] = opt
 
+    options_by_explicit[explicit_options] = options
     return options
 
 
-@dataclass
+def get_option_dest(option: Option) -> str:
+    """The attribute argparse stores the option's parsed value under"""
+    if option.dest is not UNDEFINED:
+        return option.dest
+    # same as argparse - prefer the first long flag, otherwise the first flag
+    long_flags = [f for f in option.flags if f.startswith("--")]
+    return (long_flags or option.flags)[0].lstrip("-").replace("-", "_")
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Option:
     flags: Sequence[str] = UNDEFINED
     # remainder are alphabetical
@@ -60,32 +90,56 @@ class Option:
                     raise ValueError(f"Option only supports flags, but got {f!r}")
 
     def add_argument_to_parser(self, parser: ArgumentParser) -> None:
-        kwargs = {
-            k: v
-            for k, v in (
-                # Can't use asdict() since that deep copies and we need
-                # to filter using an identity check against UNDEFINED.
-                [(f.name, getattr(self, f.name)) for f in fields(self)]
-            )
-            if v is not UNDEFINED
-        }
+        kwargs = {}
+        for name in _OPTION_FIELD_NAMES:
+            value = getattr(self, name)
+            # Can't use asdict() since that deep copies and we need
+            # to filter using an identity check against UNDEFINED.
+            if value is not UNDEFINED:
+                kwargs[name] = value
 
         flags = kwargs.pop("flags")
         parser.add_argument(*flags, **kwargs)
 
 
+_OPTION_FIELD_NAMES = tuple(f.name for f in fields(Option))
+
+# equal options share one instance so conflict checks can compare identity - keyed
+# by field values since Option itself is mutable and so unhashable
+_INTERNED_OPTIONS: dict[tuple[Any, ...], Option] = {}
+
+# templates for plainly annotated parameters - never handed out, only replace()-ed
+_EMPTY_OPTION = Option()
+_TYPED_OPTIONS: dict[Any, Option] = {t: Option(type=t) for t in (bool, float, int, str)}
+
+_KW_PARAM_KINDS = frozenset([Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY])
+
+_UNDERSCORE_TO_DASH = str.maketrans("_", "-")
+# parameter names like "verbose" tend to repeat across sessions
+_FLAG_CACHE: dict[str, str] = {}
+
+
 def _create_option(
     name: str, default: Any, annotation: Any, explicit_options: bool
 ) -> Option | None:
-    if get_origin(annotation) is Annotated:
-        anno_args = get_args(annotation)
+    opt: Option | None
+    # only Annotated[...] carries metadata - checking for it directly is cheaper
+    # than calling get_origin() and get_args()
+    metadata = getattr(annotation, "__metadata__", None)
+    if metadata is not None:
+        opt_type = annotation.__origin__
+        opt, *extra_args = metadata
     elif explicit_options:
         return None
     else:
-        anno_args = (annotation, Option())
-
-    opt: Option | None
-    opt_type, opt, *extra_args = anno_args
+        opt_type, opt, extra_args = (
+            annotation,
+            # only look up types - other annotations may not be hashable
+            _TYPED_OPTIONS.get(annotation, _EMPTY_OPTION)
+            if isinstance(annotation, type)
+            else _EMPTY_OPTION,
+            [],
+        )
 
     if extra_args:
         raise ValueError(f"{annotation} has extra metadata {extra_args}")
@@ -96,43 +150,73 @@ def _create_option(
     if not isinstance(opt, Option):
         raise ValueError(f"{annotation} metadata must be an Option")
 
+    # collect changes so only one new Option gets created
+    updates: dict[str, Any] = {}
+
     if opt.type is UNDEFINED:
         if not callable(opt_type):
             raise TypeError(
                 f"Annotation {annotation} for parameter {name!r} is not callable."
                 f"Declare option type with Annotated[..., Option(type=...)] instead."
             )
-        opt = replace(opt, type=opt_type)
+        updates["type"] = opt_type
 
-    if opt.type is bool:
-        opt = replace(
-            opt,
+    if updates.get("type", opt.type) is bool:
+        updates.update(
             action="store_false" if default is True else "store_true",
             type=UNDEFINED,
             default=UNDEFINED,
         )
     elif default is not UNDEFINED:
-        opt = replace(opt, default=default)
+        updates["default"] = default
     else:
-        opt = replace(opt, required=True)
+        updates["required"] = True
 
     if opt.flags is UNDEFINED:
-        opt = replace(opt, flags="--" + name.replace("_", "-"))
+        updates["flags"] = _flag_from_name(name)
+
+    return _intern_option(replace(opt, **updates))
+
 
-    return opt
+def _flag_from_name(name: str) -> str:
+    flag = _FLAG_CACHE.get(name)
+    if flag is None:
+        flag = sys.intern("--" + name.translate(_UNDERSCORE_TO_DASH))
+        _FLAG_CACHE[name] = flag
+    return flag
+
+
+def _intern_option(opt: Option) -> Option:
+    key = tuple(getattr(opt, name) for name in _OPTION_FIELD_NAMES)
+    try:
+        return _INTERNED_OPTIONS.setdefault(key, opt)
+    except TypeError:
+        # some field is unhashable (e.g. a list of choices)
+        return opt
 
 
 def _get_function_defaults_and_annotations(
     func: Callable[..., Any]
-) -> dict[str, tuple[Parameter, Any]]:
+) -> dict[str, tuple[Any, Any]]:
+    cached = _SIG_CACHE.get(func)
+    if cached is not None:
+        return cached
+
+    if _has_only_session_param(func):
+        result: dict[str, tuple[Any, Any]] = {}
+        _SIG_CACHE[func] = result
+        return result
+
     parameters = list(signature(func).parameters.values())
-    annotations = get_type_hints(func, include_extras=True)
+    annotations = getattr(func, "__annotations__", {})
+    if any(isinstance(a, str) for a in annotations.values()):
+        # only pay for resolving forward references when there are any
+        annotations = get_type_hints(func, include_extras=True)
 
     # skip first positional arg (the nox session obj)
     del parameters[0]
 
-    kw_param_kinds = (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
-    non_kws = [p.name for p in parameters if p.kind not in kw_param_kinds]
+    non_kws = [p.name for p in parameters if p.kind not in _KW_PARAM_KINDS]
     if non_kws:
         raise TypeError(
             f"Found non-keyword session parameters {', '.join(non_kws)} in {func}. If "
@@ -140,13 +224,24 @@ def _get_function_defaults_and_annotations(
             "original function using functools.wraps()."
         )
 
-    return {
+    result = {
         param.name: (
             UNDEFINED if param.default is Parameter.empty else param.default,
             annotations[param.name],
         )
         for param in parameters
     }
+    _SIG_CACHE[func] = result
+    return result
+
+
+def _has_only_session_param(func: Callable[..., Any]) -> bool:
+    code = getattr(func, "__code__", None)
+    return (
+        code is not None
+        and code.co_argcount + code.co_kwonlyargcount == 1
+        and not code.co_flags & (CO_VARARGS | CO_VARKEYWORDS)
+    )
 
 
 def _get_wrapped_func(given_func: Callable[..., Any]) -> Callable[..., Any]:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from typing import TYPE_CHECKING
 
 
@@ -52,50 +53,56 @@ class AutoTag:
 
     def add_func(self, name: str, func: Func) -> None:
         node = self._tag_tree
+        sep = self._sep
 
         # each branching point in the graph represents a tag
-        for word in name.split(self._sep):
-            if len(node.children) > 1:
+        for word in map(sys.intern, name.split(sep)):
+            children = node.children
+            if len(children) > 1:
                 # this is a branching point in the graph
                 node.add_tag(func)
 
-            if word in node.children:
-                node = node.children[word]
-            else:
-                if len(node.children) == 1:
+            child = children.get(word)
+            if child is None:
+                if len(children) == 1:
                     node.add_tag(func)
                     # We're about to create a new branching point - funcs added earlier
                     # will not have this node's tag.
                     node.retroactively_add_tags()
-                node = node.add_node(word, self._sep)
+                # interned since tags are compared when Nox selects sessions
+                tag = sys.intern(f"{node.tag}{sep}{word}") if node.tag else word
+                child = children[word] = _TagNode(node, tag)
+            node = child
 
         # add this func to the last node
         node.add_func(func)
 
 
 class _TagNode:
+    __slots__ = ("parent", "tag", "funcs", "children")
+
     def __init__(self, parent: _TagNode | None = None, tag: str | None = None):
         self.parent = parent
         self.tag = tag
         self.funcs: list[Func] = []
         self.children: dict[str, _TagNode] = {}
 
-    def add_node(self, word: str, sep: str) -> _TagNode:
-        tag = f"{self.tag}{sep}{word}" if self.tag else word
-        child = self.children[word] = _TagNode(self, tag)
-        return child
-
     def add_func(self, func: Func) -> None:
         self.funcs.append(func)
 
     def add_tag(self, func: Func) -> None:
-        if self.tag:
+        # tags given explicitly to the session may already include this one
+        if self.tag and self.tag not in func.tags:
             func.tags.append(self.tag)
 
     def retroactively_add_tags(self) -> None:
+        tag = self.tag
+        if not tag:
+            return
         to_visit = [self]
         while to_visit:
             node = to_visit.pop()
             for f in node.funcs:
-                self.add_tag(f)
+                if tag not in f.tags:
+                    f.tags.append(tag)
             to_visit.extend(node.children.values())
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import functools
-from argparse import ArgumentParser
-from typing import TYPE_CHECKING, Any, Callable, DefaultDict, TypeVar, overload
+from argparse import ArgumentParser, Namespace
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, overload
 
 import nox
 from nox.sessions import Session
 
 from noxopt import _config
-from noxopt._option import Option, get_function_options
+from noxopt._option import (
+    _UNDERSCORE_TO_DASH,
+    Option,
+    get_function_options,
+    get_option_dest,
+)
 from noxopt._tagging import AutoTag
 
 
@@ -28,8 +33,15 @@ if TYPE_CHECKING:
 
 else:
 
+    def _identity(f):
+        return f
+
     def copy_method_signature(func):
-        return lambda f: f
+        return _identity
+
+
+# Nox only reads these - skip copying __annotations__ and updating __dict__
+_WRAPPER_ASSIGNMENTS = ("__module__", "__name__", "__qualname__", "__doc__")
 
 
 class NoxOpt:
@@ -46,10 +58,10 @@ class NoxOpt:
         self._options_by_flags: dict[str, Option] = {}
         self._auto_tag = AutoTag() if auto_tag else None
         self._explicit_options = explicit_options
-        self._setup_funcs: DefaultDict[
-            str, list[Callable[[Session], None]]
-        ] = DefaultDict(list)
-        self._common_session_kwargs: dict[str, Any] = where or {}
+        self._setup_funcs: dict[str, list[Callable[[Session], None]]] = {}
+        # setup functions which apply to each session name - reset on new setups
+        self._setup_funcs_by_session: dict[str, list[Callable[[Session], None]]] = {}
+        self._common_session_kwargs: dict[str, Any] = dict(where or {})
         if _config.NOXOPT_TESTING:
             self._common_session_kwargs["venv_backend"] = "none"
 
@@ -64,19 +76,16 @@ class NoxOpt:
         """Designate the decorated function as a session with command line arguments."""
 
         def decorator(main_func: Any) -> Any:
-            session_name = name or main_func.__name__.replace("_", "-")
+            session_name = name or main_func.__name__.translate(_UNDERSCORE_TO_DASH)
             wrapper = _copy_nox_parametrize(
-                main_func,
-                self._create_setup_wrapper(
-                    session_name,
-                    self._create_parser_wrapper(main_func),
-                ),
+                main_func, self._create_parser_wrapper(main_func, session_name)
             )
-            session = nox.session(
-                *args,
-                name=session_name,
-                **{**self._common_session_kwargs, **kwargs},
-            )(wrapper)
+            session_kwargs = (
+                {**self._common_session_kwargs, **kwargs}
+                if kwargs
+                else self._common_session_kwargs
+            )
+            session = nox.session(*args, name=session_name, **session_kwargs)(wrapper)
             if self._auto_tag:
                 self._auto_tag.add_func(session_name, session)
             return session
@@ -104,59 +113,80 @@ class NoxOpt:
         def decorator(func: Callable[..., None]) -> Callable[..., None]:
             wrapper = self._create_parser_wrapper(func)
             for p in prefixes or [""]:
-                self._setup_funcs[p].append(wrapper)
+                self._setup_funcs.setdefault(p, []).append(wrapper)
+            self._setup_funcs_by_session.clear()
             return wrapper
 
         return decorator if func is None else decorator(func)
 
-    def _create_setup_wrapper(self, name: str, func: AnyFunc) -> AnyFunc:
-        @functools.wraps(func)
-        def wrapper(session: Session, *args: Any, **kwargs: Any) -> None:
-            for prefix, setup_funcs in self._setup_funcs.items():
-                if name.startswith(prefix):
-                    for f in setup_funcs:
-                        f(session)
-            func(session, *args, **kwargs)
+    def _get_setup_funcs(self, name: str) -> list[Callable[[Session], None]]:
+        setup_funcs = self._setup_funcs_by_session.get(name)
+        if setup_funcs is None:
+            setup_funcs = self._setup_funcs_by_session[name] = [
+                f
+                for prefix, prefix_funcs in self._setup_funcs.items()
+                if name.startswith(prefix)
+                for f in prefix_funcs
+            ]
+        return setup_funcs
+
+    def _create_parser_wrapper(
+        self, func: AnyFunc, session_name: str | None = None
+    ) -> AnyFunc:
+        dests = self._add_function_options(func)
+
+        # Sessions run their setups in this same wrapper to avoid an extra call. Hot
+        # names are bound as defaults so lookups are local rather than closures.
+        @functools.wraps(func, _WRAPPER_ASSIGNMENTS, ())
+        def wrapper(
+            session: Session,
+            *args: Any,
+            _session_name: str | None = session_name,
+            _dests: dict[str, str] = dests,
+            _get_setup_funcs: Callable[[str], list[AnyFunc]] = self._get_setup_funcs,
+            _parse_args: Callable[[list[str]], Namespace] = self._parser.parse_args,
+            _func: AnyFunc = func,
+            **kwargs: Any,
+        ) -> None:
+            if _session_name is not None:
+                for f in _get_setup_funcs(_session_name):
+                    f(session)
+            args_dict = _parse_args(session.posargs).__dict__
+            params = {k: args_dict[d] for k, d in _dests.items()}
+            _func(session, *args, **kwargs, **params)
 
         return wrapper
 
-    def _create_parser_wrapper(self, func: AnyFunc) -> AnyFunc:
-        own_params: set[str] = set()
+    def _add_function_options(self, func: AnyFunc) -> dict[str, str]:
+        # map each parameter to where argparse puts its value
+        dests: dict[str, str] = {}
         for name, option in get_function_options(func, self._explicit_options).items():
-            own_params.add(name)
             self._add_option_to_parser(option)
-
-        @functools.wraps(func)
-        def wrapper(session: Session, *args: Any, **kwargs: Any) -> None:
-            args_dict = self._parser.parse_args(session.posargs).__dict__
-            func(
-                session,
-                *args,
-                **kwargs,
-                **{k: v for k, v in args_dict.items() if k in own_params},
-            )
-
-        return wrapper
+            dests[name] = get_option_dest(option)
+        return dests
 
     def _add_option_to_parser(self, option: Option) -> None:
         already_exists = False
 
         for flag in option.flags:
             existing = self._options_by_flags.get(flag)
-            if not existing:
-                self._options_by_flags[flag] = option
-            elif existing != option:
+            if existing is None:
+                continue
+            if existing is not option and existing != option:
                 raise ValueError(
                     f"Conflicting session options:\n"
                     f"new:      {option}\n"
                     f"existing: {existing}"
                 )
-            else:
-                already_exists = True
+            already_exists = True
 
         if not already_exists:
+            # only record the option once argparse has accepted it
             option.add_argument_to_parser(self._parser)
 
+        for flag in option.flags:
+            self._options_by_flags.setdefault(flag, option)
+
 
 def _copy_nox_parametrize(func: AnyFunc, wrapper: AnyFunc) -> Callable[[Any], AnyFunc]:
     # nox.parametrize adds this attribbute
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import json
 import re
+import subprocess
+import sys
+from argparse import ArgumentError, ArgumentParser
 from contextlib import ExitStack
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import TYPE_CHECKING, Sequence
 
 import pytest
@@ -11,6 +15,7 @@ from nox._decorators import Func
 from nox._options import options as nox_options
 from nox.manifest import Manifest
 
+import noxopt
 from noxopt import Annotated, NoxOpt, Option, Session
 
 
@@ -30,6 +35,15 @@ if TYPE_CHECKING:
             ...
 
 
+def _as_pattern(pattern: str | re.Pattern, flags: int = 0) -> re.Pattern:
+    return pattern if isinstance(pattern, re.Pattern) else _compile(pattern, flags)
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern: str, flags: int) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
 @pytest.fixture
 def registry(monkeypatch: pytest.MonkeyPatch) -> dict[str, Func]:
     funcs: dict[str, Func] = {}
@@ -38,11 +52,7 @@ def registry(monkeypatch: pytest.MonkeyPatch) -> dict[str, Func]:
 
 
 @pytest.fixture
-def execute(
-    registry: dict[str, Func],
-    capsys: pytest.CaptureFixture,
-    caplog: pytest.LogCaptureFixture,
-) -> Executor:
+def execute(registry: dict[str, Func], request: pytest.FixtureRequest) -> Executor:
     def execute(
         session: str = "",
         tag: str = "",
@@ -51,19 +61,25 @@ def execute(
         prints: str | re.Pattern | None = None,
         logs: str | re.Pattern | None = None,
     ) -> None:
-        manifest = Manifest(
-            {k: v for k, v in registry.items() if k == session or tag in v.tags},
-            nox_options.namespace(posargs=posargs),
-        )
+        if session:
+            funcs = {session: registry[session]}
+        else:
+            funcs = {k: v for k, v in registry.items() if tag in v.tags}
+
+        manifest = Manifest(funcs, nox_options.namespace(posargs=posargs))
+
+        # only request capturing fixtures when their output will be checked
+        if prints:
+            capsys: pytest.CaptureFixture = request.getfixturevalue("capsys")
+        if logs:
+            caplog: pytest.LogCaptureFixture = request.getfixturevalue("caplog")
 
         if raises:
             if isinstance(raises, tuple):
                 etype, epat = raises
             else:
                 etype, epat = type(raises), str(raises)
-
-            if not isinstance(epat, re.Pattern):
-                epat = re.compile(epat)
+            epat = _as_pattern(epat)
         else:
             etype = epat = None
 
@@ -74,24 +90,15 @@ def execute(
                 runner.execute()
 
         if prints:
-            if not isinstance(prints, re.Pattern):
-                prints = re.compile(prints)
-
+            # output is searched all at once so anchors should apply per line
+            prints = _as_pattern(prints, re.MULTILINE)
             readout = capsys.readouterr()
-            for line in readout.out.split("\n") + readout.err.split("\n"):
-                if prints.search(line):
-                    break
-            else:
+            if not (prints.search(readout.out) or prints.search(readout.err)):
                 raise AssertionError(f"No output matches pattern {prints.pattern!r}")
 
         if logs:
-            if not isinstance(logs, re.Pattern):
-                logs = re.compile(logs)
-
-            for line in caplog.messages:
-                if logs.search(line):
-                    break
-            else:
+            logs = _as_pattern(logs, re.MULTILINE)
+            if not logs.search("\n".join(caplog.messages)):
                 raise AssertionError(f"No log matches pattern {logs.pattern!r}")
 
     return execute
@@ -131,6 +138,23 @@ def test_session_with_annotated_option(execute: Executor):
     assert number_value == 4
 
 
+def test_session_with_evaluated_annotations(execute: Executor):
+    group = NoxOpt()
+
+    number_value = None
+
+    def my_session(session, number=0):
+        nonlocal number_value
+        number_value = number
+
+    # this module uses postponed annotations so we assign evaluated ones manually
+    my_session.__annotations__ = {"session": Session, "number": int, "return": None}
+    group.session(my_session)
+
+    execute(session="my-session", posargs=["--number", "1"])
+    assert number_value == 1
+
+
 def test_all_options_are_flags(execute: Executor):
     group = NoxOpt()
 
@@ -213,6 +237,63 @@ def tests_error_on_conflicting_options(execute: Executor):
             ...
 
 
+def test_shared_option_with_unhashable_values(execute: Executor):
+    group = NoxOpt()
+
+    letters = []
+
+    @group.session
+    def first(
+        session: Session, letter: Annotated[str, Option(choices=["a", "b"])] = "a"
+    ) -> None:
+        letters.append(letter)
+
+    @group.session
+    def second(
+        session: Session, letter: Annotated[str, Option(choices=["a", "b"])] = "a"
+    ) -> None:
+        letters.append(letter)
+
+    execute("first", posargs=["--letter", "b"])
+    execute("second", posargs=["--letter", "b"])
+    assert letters == ["b", "b"]
+
+
+def test_invalid_option_fails_at_declaration(execute: Executor):
+    group = NoxOpt()
+
+    with pytest.raises(TypeError):
+
+        @group.session
+        def bad_session(
+            session: Session,
+            flag: Annotated[int, Option(action="store_true", type=int)] = 0,
+        ) -> None:
+            ...
+
+    values = []
+
+    @group.session
+    def good_session(session: Session, y: int = 0) -> None:
+        values.append(y)
+
+    execute("good-session", posargs=["--y", "1"])
+    execute("good-session", posargs=["--y", "2"])
+    assert values == [1, 2]
+
+
+def test_conflict_with_given_parser_fails_at_declaration():
+    parser = ArgumentParser()
+    parser.add_argument("--number")
+    group = NoxOpt(parser=parser)
+
+    with pytest.raises(ArgumentError, match="conflicting option string: --number"):
+
+        @group.session
+        def my_session(session: Session, number: int = 0) -> None:
+            ...
+
+
 def test_auto_tag(registry):
     group = NoxOpt(auto_tag=True)
 
@@ -244,13 +325,30 @@ def test_auto_tag(registry):
     def b_x_3(session: Session) -> None:
         ...
 
-    assert set(registry["a-x-1"].tags) == {"a", "a-x"}
-    assert set(registry["a-x-2"].tags) == {"a", "a-x"}
-    assert set(registry["a-y-1"].tags) == {"a", "a-y"}
-    assert set(registry["a-y-2"].tags) == {"a", "a-y"}
-    assert set(registry["b-x-1"].tags) == {"b-x"}
-    assert set(registry["b-x-2"].tags) == {"b-x"}
-    assert set(registry["b-x-3"].tags) == {"b-x"}
+    assert {name: set(func.tags) for name, func in registry.items()} == {
+        "a-x-1": {"a", "a-x"},
+        "a-x-2": {"a", "a-x"},
+        "a-y-1": {"a", "a-y"},
+        "a-y-2": {"a", "a-y"},
+        "b-x-1": {"b-x"},
+        "b-x-2": {"b-x"},
+        "b-x-3": {"b-x"},
+    }
+
+
+def test_auto_tag_with_explicit_tags(registry):
+    group = NoxOpt(auto_tag=True)
+
+    @group.session(tags=["a", "extra"])
+    def a_x(session: Session) -> None:
+        ...
+
+    @group.session
+    def a_y(session: Session) -> None:
+        ...
+
+    assert registry["a-x"].tags == ["a", "extra"]
+    assert registry["a-y"].tags == ["a"]
 
 
 def test_setup_funcs(execute: Executor):
@@ -315,6 +413,25 @@ def test_setup_funcs(execute: Executor):
     ]
 
 
+def test_setup_added_after_session_ran(execute: Executor):
+    group = NoxOpt()
+
+    calls = []
+
+    @group.session
+    def my_session(session: Session) -> None:
+        calls.append("session")
+
+    execute("my-session")
+
+    @group.setup("my-")
+    def setup_my(session: Session) -> None:
+        calls.append("setup")
+
+    execute("my-session")
+    assert calls == ["session", "setup", "session"]
+
+
 def test_required_argument(execute: Executor, caplog: pytest.LogCaptureFixture):
     group = NoxOpt()
 
@@ -379,3 +496,131 @@ def test_nox_parametrize(execute: Executor) -> None:
     execute("my-session", posargs=["--mult", "2"])
 
     assert calls == [2, 4, 6]
+
+
+def test_unhashable_annotation_is_not_callable(execute: Executor) -> None:
+    group = NoxOpt()
+
+    def my_session(session: Session, number=0) -> None:
+        ...
+
+    my_session.__annotations__["number"] = [int]
+
+    with pytest.raises(TypeError, match=r"is not callable"):
+        group.session(my_session)
+
+
+def test_custom_flags(execute: Executor) -> None:
+    group = NoxOpt()
+
+    number_value = None
+
+    @group.session
+    def my_session(
+        session: Session, number: Annotated[int, Option(flags=["-n"])] = 0
+    ) -> None:
+        nonlocal number_value
+        number_value = number
+
+    execute("my-session", posargs=["-n", "3"])
+    assert number_value == 3
+
+
+def test_custom_dest(execute: Executor) -> None:
+    group = NoxOpt()
+
+    number_value = None
+
+    @group.session
+    def my_session(
+        session: Session, number: Annotated[int, Option(dest="num")] = 0
+    ) -> None:
+        nonlocal number_value
+        number_value = number
+
+    execute("my-session", posargs=["--number", "3"])
+    assert number_value == 3
+
+
+def test_sessions_do_not_share_parsed_lists(execute: Executor) -> None:
+    group = NoxOpt()
+
+    values = []
+
+    @group.session
+    def first_session(
+        session: Session, numbers: Annotated[list, Option(nargs="*", type=int)] = []
+    ) -> None:
+        numbers.append(0)
+
+    @group.session
+    def second_session(
+        session: Session, numbers: Annotated[list, Option(nargs="*", type=int)] = []
+    ) -> None:
+        values.append(numbers)
+
+    execute("first-session", posargs=["--numbers", "1", "2"])
+    execute("second-session", posargs=["--numbers", "1", "2"])
+    assert values == [[1, 2]]
+
+
+def test_sessions_do_not_share_parsed_values(execute: Executor) -> None:
+    group = NoxOpt()
+
+    values = []
+
+    @group.session
+    def first_session(
+        session: Session, data: Annotated[dict, Option(type=json.loads)] = {}
+    ) -> None:
+        data["mutated"] = True
+
+    @group.session
+    def second_session(
+        session: Session, data: Annotated[dict, Option(type=json.loads)] = {}
+    ) -> None:
+        values.append(data)
+
+    execute("first-session", posargs=["--data", '{"a": 1}'])
+    execute("second-session", posargs=["--data", '{"a": 1}'])
+    assert values == [{"a": 1}]
+
+
+def test_option_added_after_parsing(execute: Executor) -> None:
+    group = NoxOpt()
+
+    @group.session
+    def first_session(session: Session) -> None:
+        ...
+
+    execute("first-session")
+
+    values = []
+
+    @group.session
+    def second_session(session: Session, number: int = 1) -> None:
+        values.append(number)
+
+    execute("second-session")
+    assert values == [1]
+
+
+def test_option_is_mutable() -> None:
+    opt = Option(flags=["-n"])
+    assert opt.flags == ["-n"]
+    opt.help = "a number"
+    assert opt.help == "a number"
+
+
+def test_lazy_imports() -> None:
+    code = "import sys, noxopt; assert 'nox' not in sys.modules; noxopt.NoxOpt"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        noxopt.missing
+
+
+def test_submodules_are_attributes(monkeypatch: pytest.MonkeyPatch) -> None:
+    # simulate the submodule not having been imported yet
+    monkeypatch.delattr(noxopt, "noxopt")
+    assert noxopt.noxopt.NoxOpt is NoxOpt